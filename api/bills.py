@@ -4,7 +4,7 @@ from typing import Optional, List
 from enum import Enum
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy import func, desc, nullslast
-from sqlalchemy.orm import contains_eager
+from sqlalchemy.orm import contains_eager, with_expression
 from openstates.utils.transformers import fix_bill_id
 from .db import SessionLocal, get_db, models
 from .schemas import Bill
@@ -39,11 +39,17 @@ class BillPagination(Pagination):
     ObjCls = Bill
     IncludeEnum = BillInclude
     include_map_overrides = {
-        BillInclude.sponsorships: ["sponsorships", "sponsorships.person"],
+        BillInclude.sponsorships: [
+            "sponsorships",
+            "sponsorships.person",
+            "sponsorships.organization",
+        ],
+        BillInclude.actions: ["actions", "actions.organization"],
         BillInclude.versions: ["versions", "versions.links"],
         BillInclude.documents: ["documents", "documents.links"],
         BillInclude.votes: [
             "votes",
+            "votes.organization",
             "votes.votes",
             "votes.counts",
             "votes.sources",
@@ -51,6 +57,8 @@ class BillPagination(Pagination):
         ],
     }
     max_per_page = 20
+    # base_query eagerly loads the session/jurisdiction/chamber every bill needs
+    raise_on_lazy_load = True
 
 
 router = APIRouter()
@@ -59,6 +67,15 @@ router = APIRouter()
 _likely_bill_id = re.compile(r"\w{1,3}\s*\d{1,5}")
 
 
+def search_vector_match(q):
+    # the GIN index is on the bare tsvector column, so this must stay a direct
+    # `search_vector @@ tsquery`, wrapping or casting the column (e.g. ::text) means
+    # the index can't be used and every search becomes a seq scan
+    return models.SearchableBill.search_vector.op("@@")(
+        func.websearch_to_tsquery("english", q)
+    )
+
+
 def base_query(db):
     return (
         db.query(models.Bill)
@@ -71,6 +88,17 @@ def base_query(db):
             )
         )
         .options(contains_eager(models.Bill.from_organization))
+        .options(
+            with_expression(
+                models.Bill.openstates_url,
+                func.format(
+                    "https://openstates.org/%s/bills/%s/%s/",
+                    models.Jurisdiction.abbr,
+                    models.LegislativeSession.identifier,
+                    func.replace(models.Bill.identifier, " ", ""),
+                ),
+            )
+        )
     )
 
 
@@ -174,7 +202,8 @@ async def bills_search(
         identifiers = [fix_bill_id(bill_id).upper() for bill_id in identifier]
         query = query.filter(models.Bill.identifier.in_(identifiers))
     if classification:
-        query = query.filter(models.Bill.classification.any(classification))
+        # @> rather than = ANY(), so the GIN index on classification can be used
+        query = query.filter(models.Bill.classification.contains([classification]))
     if subject:
         query = query.filter(models.Bill.subject.contains(subject))
     if sponsor:
@@ -216,11 +245,7 @@ async def bills_search(
                 func.upper(models.Bill.identifier) == fix_bill_id(q).upper()
             )
         else:
-            query = query.join(models.SearchableBill).filter(
-                models.SearchableBill.search_vector.op("@@")(
-                    func.websearch_to_tsquery("english", q)
-                )
-            )
+            query = query.join(models.SearchableBill).filter(search_vector_match(q))
 
     if not q and not jurisdiction:
         raise HTTPException(400, "either 'jurisdiction' or 'q' required")
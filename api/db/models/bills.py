@@ -1,19 +1,23 @@
-from functools import lru_cache
-from sqlalchemy import Column, String, ForeignKey, DateTime, Integer, Boolean, Text
+from functools import cached_property
+from sqlalchemy import (
+    Column,
+    String,
+    ForeignKey,
+    DateTime,
+    Integer,
+    Boolean,
+    Text,
+    Index,
+)
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY, TSVECTOR
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, query_expression
 from .. import Base
 from .common import PrimaryUUID, LinkBase, RelatedEntityBase
 from .jurisdiction import LegislativeSession
 from .people_orgs import Organization
 
 
-@lru_cache(100)
-def _jid_to_abbr(jid):
-    return jid.split(":")[-1].split("/")[0]
-
-
 class Bill(Base):
     __tablename__ = "opencivicdata_bill"
 
@@ -27,10 +31,10 @@ class Bill(Base):
     created_at = Column(DateTime(timezone=True))
     updated_at = Column(DateTime(timezone=True))
 
-    from_organization_id = Column(String, ForeignKey(Organization.id))
+    from_organization_id = Column(String, ForeignKey(Organization.id), index=True)
     from_organization = relationship("Organization")
     legislative_session_id = Column(
-        UUID(as_uuid=True), ForeignKey(LegislativeSession.id)
+        UUID(as_uuid=True), ForeignKey(LegislativeSession.id), index=True
     )
     legislative_session = relationship("LegislativeSession")
 
@@ -47,31 +51,49 @@ class Bill(Base):
         "RelatedBill", back_populates="bill", foreign_keys="RelatedBill.bill_id"
     )
 
-    @property
+    @cached_property
     def jurisdiction(self):
         return self.legislative_session.jurisdiction
 
-    @property
+    @cached_property
     def session(self):
         return self.legislative_session.identifier
 
-    @property
-    def openstates_url(self):
-        abbr = _jid_to_abbr(self.legislative_session.jurisdiction_id)
-        identifier = self.identifier.replace(" ", "")
-        return f"https://openstates.org/{abbr}/bills/{self.session}/{identifier}/"
+    # built in the SELECT from the session & jurisdiction joined in by bills.base_query
+    openstates_url = query_expression()
 
-    # computed fields
-    first_action_date = Column(String)
-    latest_action_date = Column(String)
+    # computed fields, dates are partial ISO-8601 strings (e.g. "2021" or "2021-03-01")
+    # so they stay strings, which still compare and index in date order
+    first_action_date = Column(String, index=True)
+    latest_action_date = Column(String, index=True)
     latest_action_description = Column(String)
     latest_passage_date = Column(String)
 
+    __table_args__ = (
+        # array filters are containment (@>) checks, which only GIN indexes can serve
+        Index(
+            "ix_opencivicdata_bill_classification",
+            "classification",
+            postgresql_using="gin",
+        ),
+        Index("ix_opencivicdata_bill_subject", "subject", postgresql_using="gin"),
+        # the *_action_desc sorts are DESC NULLS LAST, which the ascending indexes can't
+        # provide even when scanned backwards (that'd give DESC NULLS FIRST)
+        Index(
+            "ix_opencivicdata_bill_first_action_date_desc",
+            first_action_date.desc().nullslast(),
+        ),
+        Index(
+            "ix_opencivicdata_bill_latest_action_date_desc",
+            latest_action_date.desc().nullslast(),
+        ),
+    )
+
 
 class BillRelatedBase(PrimaryUUID):
     @declared_attr
     def bill_id(cls):
-        return Column("bill_id", ForeignKey(Bill.id))
+        return Column("bill_id", ForeignKey(Bill.id), index=True)
 
     @declared_attr
     def bill(cls):
@@ -100,8 +122,15 @@ class BillIdentifier(BillRelatedBase, Base):
 
 class BillAction(BillRelatedBase, Base):
     __tablename__ = "opencivicdata_billaction"
+    __table_args__ = (
+        # serves loading actions by bill as well as date ranges within a bill
+        Index("ix_opencivicdata_billaction_bill_id_date", "bill_id", "date"),
+    )
+
+    # no separate index, bill_id lookups are covered by the (bill_id, date) one
+    bill_id = Column("bill_id", ForeignKey(Bill.id))
 
-    organization_id = Column(String, ForeignKey(Organization.id))
+    organization_id = Column(String, ForeignKey(Organization.id), index=True)
     organization = relationship(Organization)
     description = Column(String)
     date = Column(String)
@@ -112,16 +141,16 @@ class BillAction(BillRelatedBase, Base):
 class BillActionRelatedEntity(RelatedEntityBase, Base):
     __tablename__ = "opencivicdata_billactionrelatedentity"
 
-    action_id = Column(UUID(as_uuid=True), ForeignKey(BillAction.id))
+    action_id = Column(UUID(as_uuid=True), ForeignKey(BillAction.id), index=True)
     action = relationship(BillAction)
 
 
 class RelatedBill(PrimaryUUID, Base):
     __tablename__ = "opencivicdata_relatedbill"
 
-    bill_id = Column(String, ForeignKey(Bill.id))
+    bill_id = Column(String, ForeignKey(Bill.id), index=True)
     bill = relationship(Bill, foreign_keys=[bill_id])
-    related_bill_id = Column(String, ForeignKey(Bill.id))
+    related_bill_id = Column(String, ForeignKey(Bill.id), index=True)
     related_bill = relationship(Bill, foreign_keys=[related_bill_id])
 
     identifier = Column(String)
@@ -168,21 +197,29 @@ class BillVersion(DocVerBase, Base):
 class BillDocumentLink(DocumentLinkBase, Base):
     __tablename__ = "opencivicdata_billdocumentlink"
 
-    document_id = Column(UUID(as_uuid=True), ForeignKey(BillDocument.id))
+    document_id = Column(UUID(as_uuid=True), ForeignKey(BillDocument.id), index=True)
     document = relationship(BillDocument)
 
 
 class BillVersionLink(DocumentLinkBase, Base):
     __tablename__ = "opencivicdata_billversionlink"
 
-    version_id = Column(UUID(as_uuid=True), ForeignKey(BillVersion.id))
+    version_id = Column(UUID(as_uuid=True), ForeignKey(BillVersion.id), index=True)
     version = relationship(BillVersion)
 
 
 class SearchableBill(Base):
     __tablename__ = "opencivicdata_searchablebill"
+    __table_args__ = (
+        # full text search does a seq scan without this
+        Index(
+            "ix_opencivicdata_searchablebill_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     search_vector = Column(TSVECTOR)
-    bill_id = Column(String, ForeignKey(Bill.id))
+    bill_id = Column(String, ForeignKey(Bill.id), index=True)
     bill = relationship(Bill)
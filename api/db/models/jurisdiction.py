@@ -1,12 +1,31 @@
 from .. import Base
-from sqlalchemy import Column, String, ForeignKey, Integer, Boolean, DateTime
+from sqlalchemy import (
+    Column,
+    String,
+    ForeignKey,
+    Integer,
+    Boolean,
+    DateTime,
+    Index,
+    func,
+)
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship, object_session
+from sqlalchemy.orm import relationship, object_session, column_property
 from .common import PrimaryUUID
 
 
 class Jurisdiction(Base):
     __tablename__ = "opencivicdata_jurisdiction"
+    __table_args__ = (
+        # support keyset pagination of jurisdiction_list, with & without ?classification=
+        Index("ix_opencivicdata_jurisdiction_name_id", "name", "id"),
+        Index(
+            "ix_opencivicdata_jurisdiction_classification_name_id",
+            "classification",
+            "name",
+            "id",
+        ),
+    )
 
     id = Column(String, primary_key=True, index=True)
     name = Column(String)
@@ -16,6 +35,12 @@ class Jurisdiction(Base):
     latest_bill_update = Column(DateTime)
     latest_people_update = Column(DateTime)
 
+    # e.g. ocd-jurisdiction/country:us/state:nc/government => nc, only used inside other
+    # SQL expressions (see bills.base_query) so it isn't part of regular loads
+    abbr = column_property(
+        func.split_part(func.regexp_replace(id, "^.*:", ""), "/", 1), deferred=True
+    )
+
     organizations = relationship(
         "Organization",
         primaryjoin="""and_(
@@ -1,11 +1,13 @@
+import hashlib
 from enum import Enum
 from typing import Optional, List
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 from .db import SessionLocal, get_db, models
-from .schemas import Jurisdiction, JurisdictionClassification
-from .pagination import Pagination
+from .schemas import Jurisdiction, JurisdictionClassification, RunPlan
+from .pagination import CursorPagination
 from .auth import apikey_auth
-from .utils import jurisdiction_filter
+from .utils import jurisdiction_filter, TTLCache
 
 
 class JurisdictionInclude(str, Enum):
@@ -14,7 +16,7 @@ class JurisdictionInclude(str, Enum):
     latest_runs = "latest_runs"
 
 
-class JurisdictionPagination(Pagination):
+class JurisdictionPagination(CursorPagination):
     ObjCls = Jurisdiction
     IncludeEnum = JurisdictionInclude
     include_map_overrides = {
@@ -25,21 +27,37 @@ class JurisdictionPagination(Pagination):
             "legislative_sessions.downloads",
         ],
     }
+    cursor_fields = (models.Jurisdiction.name, models.Jurisdiction.id)
     max_per_page = 52
+    max_joined_includes = 2
+    raise_on_lazy_load = True
 
     @classmethod
     def postprocess_includes(cls, obj, data, includes):
         # latest runs needs to be set on each object individually, the 20-item
         # limit makes a subquery approach not work
         if JurisdictionInclude.latest_runs in includes:
-            obj.latest_runs = data.get_latest_runs()
+            obj.latest_runs = [RunPlan.from_orm(run) for run in data.get_latest_runs()]
 
-    def __init__(self, page: int = 1, per_page: int = 52):
-        self.page = page
+    def __init__(self, cursor: Optional[str] = None, per_page: int = 52):
+        self.cursor = cursor
         self.per_page = per_page
 
 
-router = APIRouter()
+# every non-include field of the response, for serving details without the ORM
+detail_columns = [
+    getattr(models.Jurisdiction, field)
+    for field in Jurisdiction.__fields__
+    if field not in JurisdictionInclude.__members__
+]
+
+# orjson's native datetime/UUID/enum handling matches the stdlib output we had before,
+# OPT_NAIVE_UTC is deliberately not used since it'd add +00:00 to existing timestamps
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# jurisdictions change rarely, so full list responses are kept for a short while and
+# served without touching the database, keyed on everything that affects the body
+list_cache = TTLCache(maxsize=256, ttl=60)
 
 
 @router.get(
@@ -58,17 +76,35 @@ async def jurisdiction_list(
     db: SessionLocal = Depends(get_db),
     pagination: JurisdictionPagination = Depends(),
     auth: str = Depends(apikey_auth),
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     Get list of supported Jurisdictions, a Jurisdiction is a state or municipality.
     """
-    query = db.query(models.Jurisdiction).order_by(models.Jurisdiction.name)
+    cache_key = (
+        classification,
+        tuple(sorted(include)),
+        pagination.cursor,
+        pagination.per_page,
+    )
+    cached = list_cache.get(cache_key)
+    if cached:
+        etag, body = cached
+    else:
+        query = db.query(models.Jurisdiction)
 
-    # handle parameters
-    if classification:
-        query = query.filter(models.Jurisdiction.classification == classification)
+        # handle parameters
+        if classification:
+            query = query.filter(models.Jurisdiction.classification == classification)
 
-    return pagination.paginate(query, includes=include)
+        body = pagination.render(query, includes=include)
+        # a hash of the body itself, so it only matches when nothing at all changed
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        list_cache.set(cache_key, (etag, body))
+
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
 
 
 @router.get(
@@ -87,7 +123,14 @@ async def jurisdiction_detail(
     auth: str = Depends(apikey_auth),
 ):
     """Get details on a single Jurisdiction (e.g. state or municipality)."""
-    query = db.query(models.Jurisdiction).filter(
-        jurisdiction_filter(jurisdiction_id, jid_field=models.Jurisdiction.id)
-    )
+    jfilter = jurisdiction_filter(jurisdiction_id, jid_field=models.Jurisdiction.id)
+    if not include:
+        # nothing to load alongside it, so skip hydrating an ORM object and build the
+        # response straight from the needed columns
+        row = db.query(*detail_columns).filter(jfilter).one_or_none()
+        if row is None:
+            raise HTTPException(status_code=404, detail="No such Jurisdiction.")
+        return Jurisdiction(**row._mapping)
+
+    query = db.query(models.Jurisdiction).filter(jfilter)
     return JurisdictionPagination.detail(query, includes=include)
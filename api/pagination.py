@@ -1,8 +1,13 @@
 import math
-from typing import List
+import json
+import base64
+import binascii
+import orjson
+from typing import List, Optional
 from pydantic import create_model, BaseModel, Field
 from fastapi import HTTPException
-from sqlalchemy.orm import noload, selectinload
+from sqlalchemy import tuple_
+from sqlalchemy.orm import joinedload, noload, raiseload, selectinload
 from sqlalchemy.orm.exc import NoResultFound
 
 
@@ -13,6 +18,13 @@ class PaginationMeta(BaseModel):
     total_items: int = Field(..., example=52)
 
 
+class CursorPaginationMeta(BaseModel):
+    per_page: int = Field(..., example=20)
+    next_cursor: Optional[str] = Field(
+        None, example="WyJOZWJyYXNrYSIsICJvY2QtanVyaXNkaWN0aW9uLy4uLiJd"
+    )
+
+
 class Pagination:
     """
     Base class that handles pagination and includes= behavior together.
@@ -23,6 +35,11 @@ class Pagination:
         - include_map_overrides - mapping of what fields to select-in if included
                         (default to same name as IncludeEnum properties)
         - postprocess_includes - function to call on each object to set includes
+        - max_joined_includes - (optional) on detail views, JOIN up to this many includes
+                        into the main query instead of selecting them in separately
+        - max_offset - (optional) pages starting past this many rows are rejected
+        - raise_on_lazy_load - (optional) raise instead of lazy loading anything that
+                        wasn't loaded by the query
 
     Once those are set all of the basic methods work as classmethods so they can be called by
      PaginationSubclass.detail.
@@ -31,6 +48,12 @@ class Pagination:
     pagination.
     """
 
+    max_joined_includes = 0
+    raise_on_lazy_load = False
+    # OFFSET still reads & discards every skipped row, so very deep pages cost far more
+    # than the rows they return
+    max_offset = 10000
+
     def __init__(self, page: int = 1, per_page: int = 10):
         self.page = page
         self.per_page = per_page
@@ -50,6 +73,13 @@ class Pagination:
             pagination=(PaginationMeta, ...),
         )
 
+    def check_per_page(self):
+        if self.per_page < 1 or self.per_page > self.max_per_page:
+            raise HTTPException(
+                status_code=400,
+                detail=f"invalid per_page, must be in [1, {self.max_per_page}]",
+            )
+
     def paginate(
         self,
         results,
@@ -63,10 +93,14 @@ class Pagination:
                 status_code=500, detail="ordering is required for pagination"
             )
 
-        if self.per_page < 1 or self.per_page > self.max_per_page:
+        self.check_per_page()
+
+        # checked before counting, so deep paging is refused without touching the table
+        if (self.page - 1) * self.per_page >= self.max_offset:
             raise HTTPException(
                 status_code=400,
-                detail=f"invalid per_page, must be in [1, {self.max_per_page}]",
+                detail=f"page too deep, results past the first {self.max_offset} are "
+                "not available, use additional filters to narrow the results",
             )
 
         if not skip_count:
@@ -105,7 +139,7 @@ class Pagination:
     @classmethod
     def detail(cls, query, *, includes):
         """convert a single instance query to a model with the appropriate includes"""
-        query = cls.select_or_noload(query, includes)
+        query = cls.select_or_noload(query, includes, single=True)
         try:
             obj = query.one()
         except NoResultFound:
@@ -132,8 +166,14 @@ class Pagination:
         return newobj
 
     @classmethod
-    def select_or_noload(cls, query, includes):
+    def select_or_noload(cls, query, includes, *, single=False):
         """either pre-join or no-load data based on whether it has been requested"""
+        # joinedload duplicates the parent row for every related row, which is wasteful
+        # on lists, but when loading a single object the duplication is just the size of
+        # the (few) joined collections and saves a round-trip for each of them
+        loaded = [fieldname for fieldname in includes if cls.include_map()[fieldname]]
+        join = single and len(loaded) <= cls.max_joined_includes
+
         for fieldname in cls.IncludeEnum:
             if fieldname in includes:
                 # selectinload seems like a strong default choice, but it is possible that
@@ -144,5 +184,104 @@ class Pagination:
 
             # update the query with appropriate loader
             for dbname in cls.include_map()[fieldname]:
-                query = query.options(loader(dbname))
+                # nested relationships are still selected-in, joining them as well would
+                # multiply the duplicated rows
+                if join and loader is selectinload and "." not in dbname:
+                    query = query.options(joinedload(dbname))
+                else:
+                    query = query.options(loader(dbname))
+
+        if cls.raise_on_lazy_load:
+            # anything not loaded up front would be one query per object, fail loudly
+            query = query.options(raiseload("*"))
         return query
+
+
+class CursorPagination(Pagination):
+    """
+    Keyset ("seek") pagination, for endpoints that don't need page numbers or totals.
+
+    Instead of COUNT(*) + OFFSET/LIMIT, results are ordered by cursor_fields and each
+    page picks up after the last row of the previous one with a
+    WHERE (cursor_fields) > (last values) predicate, so every page costs the same
+    single query no matter how deep the client goes.
+
+    In addition to the Pagination properties, subclasses must set:
+        - cursor_fields - tuple of string columns to order by, together they must
+                        be unique
+
+    Queries passed to paginate should not be ordered, the ordering is applied here.
+    """
+
+    def __init__(self, cursor: Optional[str] = None, per_page: int = 10):
+        self.cursor = cursor
+        self.per_page = per_page
+
+    @classmethod
+    def response_model(cls):
+        return create_model(
+            f"{cls.ObjCls.__name__}List",
+            results=(List[cls.ObjCls], ...),
+            pagination=(CursorPaginationMeta, ...),
+        )
+
+    @classmethod
+    def encode_cursor(cls, obj):
+        values = [getattr(obj, field.key) for field in cls.cursor_fields]
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    @classmethod
+    def decode_cursor(cls, cursor):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor))
+        except (binascii.Error, ValueError):
+            values = None
+        # values end up compared against the cursor columns in SQL, anything that isn't
+        # a plain string would fail there (or in psycopg2) instead of here
+        if (
+            not isinstance(values, list)
+            or len(values) != len(cls.cursor_fields)
+            or not all(isinstance(v, str) and "\x00" not in v for v in values)
+        ):
+            raise HTTPException(status_code=400, detail="invalid cursor")
+        return values
+
+    def page_query(self, results, includes):
+        """order, seek & limit the query to the requested page (plus one extra row)"""
+        self.check_per_page()
+
+        if self.cursor:
+            last_values = self.decode_cursor(self.cursor)
+            results = results.filter(tuple_(*self.cursor_fields) > tuple_(*last_values))
+
+        results = self.select_or_noload(results.order_by(*self.cursor_fields), includes)
+        # grab one extra row, if it comes back there's another page
+        return results.limit(self.per_page + 1)
+
+    def paginate(self, results, *, includes=None, skip_count=False):
+        # there's never a count to skip, the argument just mirrors Pagination.paginate
+        results = self.page_query(results, includes).all()
+        next_cursor = None
+        if len(results) > self.per_page:
+            results = results[: self.per_page]
+            next_cursor = self.encode_cursor(results[-1])
+        results = [self.to_obj_with_includes(data, includes) for data in results]
+
+        meta = CursorPaginationMeta(per_page=self.per_page, next_cursor=next_cursor)
+
+        return {"pagination": meta, "results": results}
+
+    def render(self, results, *, includes=None):
+        """
+        Same response as paginate, encoded straight to JSON bytes with orjson.
+
+        Note that this bypasses the route's response_model, so the output must match
+        what response_model_exclude_none=True would produce.
+        """
+        page = self.paginate(results, includes=includes)
+        return orjson.dumps(
+            {
+                "results": [obj.dict(exclude_none=True) for obj in page["results"]],
+                "pagination": page["pagination"].dict(exclude_none=True),
+            }
+        )
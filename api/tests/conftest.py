@@ -1,11 +1,13 @@
 import os
 import pytest
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy_utils.functions import database_exists, drop_database, create_database
 from sqlalchemy.exc import OperationalError
 from fastapi.testclient import TestClient
 from api.main import app
+from api.jurisdictions import list_cache
 from api.auth import apikey_auth
 from api.db import Base, get_db
 from . import fixtures
@@ -32,6 +34,23 @@ class QueryLogger:
 query_logger = QueryLogger()
 
 
+def explain(query, **settings):
+    """
+    EXPLAIN a query (or statement), after applying planner settings such as
+    enable_seqscan="off". The test tables are tiny, so the planner usually needs to be
+    pushed off seq scans to prove it *can* use an index.
+    """
+    sql = getattr(query, "statement", query).compile(dialect=postgresql.dialect())
+    db = TestingSessionLocal()
+    try:
+        for name, value in settings.items():
+            db.execute(text(f"SET {name} = {value}"))
+        plan = db.connection().exec_driver_sql(f"EXPLAIN {sql}", sql.params)
+        return "\n".join(row[0] for row in plan)
+    finally:
+        db.close()
+
+
 def get_test_db():
     try:
         db = TestingSessionLocal()
@@ -74,5 +93,6 @@ def common_data(create_test_database):
 
 @pytest.fixture
 def client():
+    list_cache.clear()
     client = TestClient(app)
     return client
@@ -1,5 +1,7 @@
-from .conftest import query_logger
-from api.bills import BillSortOption
+from sqlalchemy import desc, nullslast, select
+from .conftest import query_logger, explain
+from api.db import models
+from api.bills import BillInclude, BillSortOption, search_vector_match
 
 
 def test_bills_filter_by_jurisdiction_abbr(client):
@@ -124,6 +126,47 @@ def test_bills_filter_by_query(client):
     assert len(response.json()["results"]) == 0
 
 
+def test_bills_query_uses_search_index():
+    query = select(models.SearchableBill.bill_id).where(search_vector_match("HIOO"))
+    plan = explain(query, enable_seqscan="off")
+    assert "ix_opencivicdata_searchablebill_search_vector" in plan
+
+
+def test_bills_action_since_uses_index():
+    query = select(models.Bill.id).where(models.Bill.latest_action_date >= "2020-01-01")
+    plan = explain(query, enable_seqscan="off")
+    assert "ix_opencivicdata_bill_latest_action_date" in plan
+
+
+def test_bills_latest_action_desc_uses_index():
+    query = (
+        select(models.Bill.id)
+        .order_by(nullslast(desc(models.Bill.latest_action_date)))
+        .limit(10)
+    )
+    plan = explain(query, enable_seqscan="off", enable_sort="off")
+    # the index scan feeds the LIMIT directly, no Sort needed
+    assert (
+        plan.splitlines()[1]
+        .strip()
+        .startswith(
+            "->  Index Scan using ix_opencivicdata_bill_latest_action_date_desc"
+        )
+    )
+
+
+def test_bills_classification_filter_uses_index():
+    query = select(models.Bill.id).where(models.Bill.classification.contains(["bill"]))
+    plan = explain(query, enable_seqscan="off")
+    assert "ix_opencivicdata_bill_classification" in plan
+
+
+def test_bills_subject_filter_uses_index():
+    query = select(models.Bill.id).where(models.Bill.subject.contains(["futurism"]))
+    plan = explain(query, enable_seqscan="off")
+    assert "ix_opencivicdata_bill_subject" in plan
+
+
 def test_bills_filter_by_query_bill_id(client):
     response = client.get("/bills?q=HB 1")
     assert len(response.json()["results"]) == 1
@@ -180,7 +223,7 @@ def test_bills_include_basics(client):
         "/bills?jurisdiction=ne&session=2020&include=sponsorships&include=abstracts"
         "&include=other_titles&include=other_identifiers&include=actions&include=sources"
     )
-    assert query_logger.count == 8
+    assert query_logger.count == 9
     assert response.status_code == 200
     for b in response.json()["results"]:
         assert len(b["sponsorships"]) == 2
@@ -386,3 +429,13 @@ def test_bill_detail_sponsorship_resolution(client):
         },
     }
     assert query_logger.count == 3
+
+
+def test_bills_includes_preloaded(client):
+    # query counts can't show per-bill lazy loads here, the fixtures share a handful of
+    # organizations so those would hit the identity map, but BillPagination raises on
+    # any lazy load, so this only succeeds if every include was loaded up front
+    includes = "&".join(f"include={i.value}" for i in BillInclude)
+    response = client.get(f"/bills?jurisdiction=ne&session=2020&per_page=5&{includes}")
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == 5
@@ -1,9 +1,14 @@
-from .conftest import query_logger
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Query
+from api.main import app
+from api.db import models
+from api.jurisdictions import JurisdictionPagination, list_cache
+from .conftest import query_logger, explain, TestingSessionLocal
 
 
 def test_jurisdictions_simplest(client):
     response = client.get("/jurisdictions")
-    assert query_logger.count == 2
+    assert query_logger.count == 1
     response = response.json()
     assert len(response["results"]) == 3
     assert response["results"][0]["name"] == "Mentor"
@@ -24,11 +29,29 @@ def test_jurisdictions_filter(client):
     response = client.get("/jurisdictions?classification=state")
     response = response.json()
     assert len(response["results"]) == 2
-    assert query_logger.count == 2
+    assert query_logger.count == 1
     response = client.get("/jurisdictions?classification=municipality")
     response = response.json()
     assert len(response["results"]) == 1
-    assert query_logger.count == 2
+    assert query_logger.count == 1
+
+
+def test_jurisdictions_filter_uses_index():
+    query = JurisdictionPagination(per_page=10).page_query(
+        Query(models.Jurisdiction).filter(
+            models.Jurisdiction.classification == "state"
+        ),
+        [],
+    )
+    plan = explain(query, enable_seqscan="off", enable_sort="off")
+    # the index scan feeds the LIMIT directly, no Sort needed for (name, id) order
+    assert (
+        plan.splitlines()[1]
+        .strip()
+        .startswith(
+            "->  Index Scan using ix_opencivicdata_jurisdiction_classification_name_id"
+        )
+    )
 
 
 def test_jurisdiction_include_organizations(client):
@@ -37,7 +60,7 @@ def test_jurisdiction_include_organizations(client):
     )
     response = response.json()
     # is included, organizations are inline
-    assert query_logger.count == 4
+    assert query_logger.count == 3
     assert len(response["results"][0]["organizations"]) == 2
     assert response["results"][0]["organizations"][0] == {
         "id": "nel",
@@ -61,7 +84,7 @@ def test_jurisdiction_include_organizations_empty(client):
     response = response.json()
     # is included, but the field is empty
     assert len(response["results"][0]["organizations"]) == 0
-    assert query_logger.count == 3
+    assert query_logger.count == 2
 
 
 def test_jurisdictions_include_runs(client):
@@ -72,7 +95,7 @@ def test_jurisdictions_include_runs(client):
     # is included, but the field is empty
     assert len(response["results"][0]["latest_runs"]) == 20
     # this necessarily does N+1 queries, might need to restrict
-    assert query_logger.count == 4
+    assert query_logger.count == 3
 
 
 def test_jurisdictions_include_runs_empty(client):
@@ -82,7 +105,7 @@ def test_jurisdictions_include_runs_empty(client):
     response = response.json()
     # is included, but the field is empty
     assert len(response["results"][0]["latest_runs"]) == 0
-    assert query_logger.count == 3
+    assert query_logger.count == 2
 
 
 def test_jurisdiction_include_sessions(client):
@@ -91,7 +114,7 @@ def test_jurisdiction_include_sessions(client):
     )
     response = response.json()
     # is included, legislative sessions are inline
-    assert query_logger.count == 4
+    assert query_logger.count == 3
     assert len(response["results"][0]["legislative_sessions"]) == 2
     assert response["results"][0]["legislative_sessions"][0] == {
         "identifier": "2020",
@@ -110,6 +133,51 @@ def test_jurisdiction_include_sessions(client):
     }
 
 
+def test_jurisdiction_include_all_query_count(client):
+    # includes are loaded per page, not per jurisdiction
+    for per_page in (1, 3):
+        response = client.get(
+            f"/jurisdictions?per_page={per_page}"
+            "&include=organizations&include=legislative_sessions"
+        )
+        assert response.status_code == 200
+        assert len(response.json()["results"]) == per_page
+        assert query_logger.count == 5
+
+
+def test_jurisdictions_all_includes(client):
+    response = client.get(
+        "/jurisdictions?per_page=2&include=organizations"
+        "&include=legislative_sessions&include=latest_runs"
+    )
+    assert response.headers["content-type"] == "application/json"
+    response = response.json()
+    assert [r["name"] for r in response["results"]] == ["Mentor", "Nebraska"]
+    assert response["results"][0]["organizations"] == []
+    assert len(response["results"][1]["latest_runs"]) == 20
+    assert response["results"][1]["latest_runs"][0] == {
+        "success": True,
+        "start_time": "2020-03-21T00:00:00",
+        "end_time": "2020-03-21T03:00:00",
+    }
+    assert set(response["pagination"]) == {"per_page", "next_cursor"}
+
+
+def test_jurisdictions_invalid_row_is_an_error():
+    # a row that fails validation must fail the request, not cut a 200 body short
+    db = TestingSessionLocal()
+    jurisdiction = db.query(models.Jurisdiction).filter_by(name="Mentor").one()
+    url, jurisdiction.url = jurisdiction.url, None
+    db.commit()
+    try:
+        response = TestClient(app, raise_server_exceptions=False).get("/jurisdictions")
+    finally:
+        jurisdiction.url = url
+        db.commit()
+        db.close()
+    assert response.status_code == 500
+
+
 NEBRASKA_RESPONSE = {
     "id": "ocd-jurisdiction/country:us/state:ne/government",
     "name": "Nebraska",
@@ -121,6 +189,41 @@ NEBRASKA_RESPONSE = {
 }
 
 
+def test_jurisdictions_cached(client):
+    first = client.get("/jurisdictions?include=organizations")
+    assert query_logger.count == 3
+    etag = first.headers["etag"]
+
+    # served from memory, same body & ETag
+    second = client.get("/jurisdictions?include=organizations")
+    assert query_logger.count == 0
+    assert second.json() == first.json()
+    assert second.headers["etag"] == etag
+
+    # different parameters are a different response
+    response = client.get("/jurisdictions")
+    assert response.headers["etag"] != etag
+
+
+def test_jurisdictions_not_modified(client):
+    etag = client.get("/jurisdictions").headers["etag"]
+
+    response = client.get("/jurisdictions", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert query_logger.count == 0
+
+    # a freshly built body gets the same ETag, since nothing changed
+    list_cache.clear()
+    response = client.get("/jurisdictions", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert query_logger.count == 1
+
+    response = client.get("/jurisdictions", headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+    assert response.headers["etag"] == etag
+
+
 def test_jurisdiction_detail_by_abbr(client):
     response = client.get("/jurisdictions/ne").json()
     assert response == NEBRASKA_RESPONSE
@@ -150,6 +253,23 @@ def test_jurisdiction_detail_404(client):
 def test_jurisdiction_include_orgs(client):
     response = client.get("/jurisdictions/ne?include=organizations").json()
     assert len(response["organizations"]) == 2
+    # organizations are joined, posts selected in
+    assert query_logger.count == 2
+
+
+def test_jurisdiction_include_orgs_and_sessions(client):
+    response = client.get(
+        "/jurisdictions/ne?include=organizations&include=legislative_sessions"
+    ).json()
+    # joining both collections duplicates rows in SQL, but not in the response
+    assert len(response["organizations"]) == 2
+    assert len(response["organizations"][0]["districts"]) == 1
+    assert [s["identifier"] for s in response["legislative_sessions"]] == [
+        "2020",
+        "2021",
+    ]
+    assert len(response["legislative_sessions"][0]["downloads"]) == 1
+    # both collections are joined, posts & downloads selected in
     assert query_logger.count == 3
 
 
@@ -1,15 +1,16 @@
 import pytest
 from api.db import get_db, models
 from api.pagination import Pagination
+from .conftest import query_logger
 
 
 def test_pagination_basic(client):
-    response = client.get("/jurisdictions")
+    response = client.get("/committees?jurisdiction=oh")
     response = response.json()
     assert response["pagination"] == {
         "page": 1,
         "max_page": 1,
-        "per_page": 52,
+        "per_page": 20,
         "total_items": 3,
     }
 
@@ -26,7 +27,7 @@ def test_pagination_empty(client):
 
 
 def test_pagination_per_page(client):
-    response = client.get("/jurisdictions?per_page=2")
+    response = client.get("/committees?jurisdiction=oh&per_page=2")
     response = response.json()
     assert response["pagination"] == {
         "page": 1,
@@ -37,9 +38,9 @@ def test_pagination_per_page(client):
 
 
 def test_pagination_page2(client):
-    response = client.get("/jurisdictions?per_page=2&page=2")
+    response = client.get("/committees?jurisdiction=oh&per_page=2&page=2")
     response = response.json()
-    assert response["results"][0]["name"] == "Ohio"
+    assert response["results"][0]["name"] == "Senate Committee on Education"
     assert response["pagination"] == {
         "page": 2,
         "max_page": 2,
@@ -49,29 +50,41 @@ def test_pagination_page2(client):
 
 
 def test_pagination_invalid_per_page(client):
-    response = client.get("/jurisdictions?per_page=0")
+    response = client.get("/committees?jurisdiction=oh&per_page=0")
     assert response.status_code == 400
     response = response.json()
     assert "invalid per_page" in response["detail"]
 
-    response = client.get("/jurisdictions?per_page=999")
+    response = client.get("/committees?jurisdiction=oh&per_page=999")
     assert response.status_code == 400
     response = response.json()
     assert "invalid per_page" in response["detail"]
 
 
 def test_pagination_invalid_page(client):
-    response = client.get("/jurisdictions?per_page=2&page=0")
+    response = client.get("/committees?jurisdiction=oh&per_page=2&page=0")
     assert response.status_code == 404
     response = response.json()
     assert "invalid page" in response["detail"]
 
-    response = client.get("/jurisdictions?per_page=2&page=5")
+    response = client.get("/committees?jurisdiction=oh&per_page=2&page=5")
     assert response.status_code == 404
     response = response.json()
     assert "invalid page" in response["detail"]
 
 
+def test_pagination_deep_offset(client):
+    response = client.get("/committees?jurisdiction=oh&per_page=20&page=501")
+    assert response.status_code == 400
+    assert "page too deep" in response.json()["detail"]
+    # refused before counting anything
+    assert query_logger.count == 0
+
+    # the last allowed page is still just out of range
+    response = client.get("/committees?jurisdiction=oh&per_page=20&page=500")
+    assert response.status_code == 404
+
+
 def test_pagination_no_order_by():
     db = list(get_db())[0]
     query = db.query(models.Jurisdiction)
@@ -79,3 +92,55 @@ def test_pagination_no_order_by():
     with pytest.raises(Exception) as e:
         p.paginate(query)
     assert "ordering is required for pagination" in str(e)
+
+
+def test_cursor_pagination_basic(client):
+    response = client.get("/jurisdictions")
+    response = response.json()
+    # last page, no cursor to follow
+    assert response["pagination"] == {"per_page": 52}
+
+
+def test_cursor_pagination_next_cursor(client):
+    response = client.get("/jurisdictions?per_page=2").json()
+    assert [r["name"] for r in response["results"]] == ["Mentor", "Nebraska"]
+    assert response["pagination"]["per_page"] == 2
+    cursor = response["pagination"]["next_cursor"]
+
+    response = client.get(f"/jurisdictions?per_page=2&cursor={cursor}")
+    # one query per page, no matter how deep
+    assert query_logger.count == 1
+    response = response.json()
+    assert [r["name"] for r in response["results"]] == ["Ohio"]
+    assert response["pagination"] == {"per_page": 2}
+
+
+def test_cursor_pagination_exact_fit(client):
+    # a page that ends exactly at the last row shouldn't point to an empty page
+    response = client.get("/jurisdictions?per_page=3").json()
+    assert len(response["results"]) == 3
+    assert "next_cursor" not in response["pagination"]
+
+
+def test_cursor_pagination_invalid_per_page(client):
+    response = client.get("/jurisdictions?per_page=0")
+    assert response.status_code == 400
+    assert "invalid per_page" in response.json()["detail"]
+
+    response = client.get("/jurisdictions?per_page=999")
+    assert response.status_code == 400
+    assert "invalid per_page" in response.json()["detail"]
+
+
+def test_cursor_pagination_invalid_cursor(client):
+    for cursor in (
+        "garbage",
+        "WyJPaGlvIl0=",  # ["Ohio"]
+        "bm90IGpzb24=",  # not json
+        "WzEsMl0=",  # [1,2]
+        "W3t9LCAieCJd",  # [{}, "x"]
+        "WyJhXHUwMDAwIiwgImIiXQ==",  # ["a\u0000", "b"]
+    ):
+        response = client.get(f"/jurisdictions?cursor={cursor}")
+        assert response.status_code == 400
+        assert response.json() == {"detail": "invalid cursor"}
@@ -1,3 +1,6 @@
+import time
+import threading
+from collections import OrderedDict
 from sqlalchemy import and_
 from .db import models
 from openstates.metadata import lookup
@@ -22,3 +25,35 @@ def jurisdiction_filter(j: str, *, jid_field):
         return and_(
             models.Jurisdiction.name == j, models.Jurisdiction.classification == "state"
         )
+
+
+class TTLCache:
+    """
+    Minimal in-process cache: entries expire ttl seconds after being set, and the
+    oldest entries are evicted once there are more than maxsize.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            expires, value = self._data.get(key, (0, None))
+            if expires < time.monotonic():
+                self._data.pop(key, None)
+                return None
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()